@@ -8,6 +8,19 @@ from .models import LeaveEntitlement, LeaveRequest, LeaveType, User
 
 # Register your models here.
 
+# Columns needed to render a user's __str__ in a changelist
+USER_STR_FIELDS = ("username", "first_name", "last_name", "employee_id")
+
+
+def _related_fields(relation, fields=USER_STR_FIELDS):
+    return [f"{relation}__{field}" for field in fields]
+
+
+def _is_changelist(request):
+    # Columns are only trimmed on list pages, change forms need every field
+    match = getattr(request, "resolver_match", None)
+    return match is not None and (match.url_name or "").endswith("_changelist")
+
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -44,17 +57,35 @@ class UserAdmin(BaseUserAdmin):
         "manager",
         "is_staff",
     )  # which columns to show on the change list page
+    list_select_related = ("manager",)
+    autocomplete_fields = ("manager",)
     search_fields = ("username", "employee_id", "email")
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request).select_related("manager")
+        if _is_changelist(request):
+            qs = qs.only(
+                *USER_STR_FIELDS, "email", "is_staff", *_related_fields("manager")
+            )
+        return qs
+
 
 @admin.register(TimeEntry)
 class TimeEntryAdmin(admin.ModelAdmin):
     list_display = ("user", "date", "hours")
     list_filter = ("user", "date")
+    list_select_related = ("user", "project")
+    autocomplete_fields = ("user", "project")
     search_fields = (
         "user__username",
     )  # search by username of the user who made the entry
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request).select_related("user", "project")
+        if _is_changelist(request):
+            qs = qs.only("date", "hours", "project__code", *_related_fields("user"))
+        return qs
+
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
@@ -82,18 +113,34 @@ class LeaveEntitlementAdmin(admin.ModelAdmin):
         "get_remaining_days",
     ]
     list_filter = ["year", "leave_type"]
+    list_select_related = ["user", "leave_type"]
+    autocomplete_fields = ["user", "leave_type"]
     search_fields = ["user__username", "user__first_name", "user__last_name"]
     readonly_fields = ["get_used_days", "get_remaining_days"]
 
+    def get_queryset(self, request):
+        # annotate usage in one query rather than a SUM per row
+        qs = super().get_queryset(request).select_related("user", "leave_type")
+        if _is_changelist(request):
+            qs = qs.only(
+                "year",
+                "allocated_days",
+                "leave_type__name",
+                *_related_fields("user"),
+            )
+        return LeaveEntitlement.with_usage(qs)
+
     def get_used_days(self, obj):
-        return obj.used_days
+        return obj.used
 
     get_used_days.short_description = "Used Days"
+    get_used_days.admin_order_field = "used"
 
     def get_remaining_days(self, obj):
-        return obj.remaining_days
+        return obj.remaining
 
     get_remaining_days.short_description = "Remaining Days"
+    get_remaining_days.admin_order_field = "remaining"
 
 
 @admin.register(LeaveRequest)
@@ -108,6 +155,8 @@ class LeaveRequestAdmin(admin.ModelAdmin):
         "created",
     ]
     list_filter = ["status", "leave_type", "created"]
+    list_select_related = ["user", "leave_type", "approved_by"]
+    autocomplete_fields = ["user", "leave_type", "approved_by"]
     search_fields = ["user__username", "user__first_name", "user__last_name"]
     readonly_fields = ["total_days", "created", "updated"]
     date_hierarchy = "start_date"
@@ -136,6 +185,26 @@ class LeaveRequestAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        qs = (
+            super()
+            .get_queryset(request)
+            .select_related("user", "leave_type", "approved_by")
+        )
+        if _is_changelist(request):
+            # skips the comments / rejection_reason text columns
+            qs = qs.only(
+                "start_date",
+                "end_date",
+                "total_days",
+                "status",
+                "created",
+                "leave_type__name",
+                "approved_by__username",
+                *_related_fields("user"),
+            )
+        return qs
+
     def save_model(self, request, obj, form, change):
         if not change:  # New object
             obj.user = request.user
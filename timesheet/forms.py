@@ -1,10 +1,15 @@
-from datetime import date, timedelta
-
 from django import forms
 from django.contrib.auth.forms import UserChangeForm, UserCreationForm
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
-from .models import LeaveEntitlement, LeaveRequest, LeaveType, User
+from .models import (
+    LeaveEntitlement,
+    LeaveRequest,
+    LeaveType,
+    User,
+    active_leave_type_choices,
+)
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -25,18 +30,10 @@ class LeaveRequestForm(forms.ModelForm):
         fields = ["leave_type", "start_date", "end_date", "comments"]
         widgets = {
             "start_date": forms.DateInput(
-                attrs={
-                    "type": "date",
-                    "class": "form-control",
-                    "min": date.today().isoformat(),
-                }
+                attrs={"type": "date", "class": "form-control"}
             ),
             "end_date": forms.DateInput(
-                attrs={
-                    "type": "date",
-                    "class": "form-control",
-                    "min": date.today().isoformat(),
-                }
+                attrs={"type": "date", "class": "form-control"}
             ),
             "leave_type": forms.Select(attrs={"class": "form-control"}),
             "comments": forms.Textarea(
@@ -63,15 +60,20 @@ class LeaveRequestForm(forms.ModelForm):
         self.user = kwargs.pop("user", None)
         super().__init__(*args, **kwargs)
 
-        # only show active leave types
-        self.fields["leave_type"].queryset = LeaveType.objects.filter(active=True)
-        self.fields["leave_type"].empty_label = "Select leave type....."
-
-        # Add CSS classes for styling
-        for field_name, field in self.fields.items():
-            field.widget.attrs.update(
-                {"class": f"{field.widget.attrs.get('class', '')} form-control".strip()}
-            )
+        # only show active leave types, rendered from the cached choices while
+        # the queryset still validates the submitted one
+        leave_type = self.fields["leave_type"]
+        leave_type.queryset = LeaveType.objects.filter(active=True)
+        leave_type.empty_label = "Select leave type....."
+        leave_type.choices = [
+            ("", leave_type.empty_label),
+            *active_leave_type_choices(),
+        ]
+
+        # set per render so the earliest selectable date doesn't go stale
+        today = timezone.localdate().isoformat()
+        self.fields["start_date"].widget.attrs["min"] = today
+        self.fields["end_date"].widget.attrs["min"] = today
 
     def clean(self):
         cleaned_data = super().clean()
@@ -85,7 +87,7 @@ class LeaveRequestForm(forms.ModelForm):
         # Validating the date range
         if start_date > end_date:
             raise ValidationError("Start date cannot be after end date.")
-        if start_date < date.today():
+        if start_date < timezone.localdate():
             raise ValidationError("Start date cannot be before today.")
 
         # check for overlapping requests
@@ -103,24 +105,9 @@ class LeaveRequestForm(forms.ModelForm):
                     "You have an overlapping leave request. Please adjust your dates."
                 )
 
-        # Calculating and validating business days
-        if start_date and end_date:
-            temp_request = LeaveRequest(start_date=start_date, end_date=end_date)
-            total_days = temp_request.calculate_business_days()
-            cleaned_data["total_days"] = total_days
-
+        # total_days is derived from the dates in LeaveRequest.save()
         return cleaned_data
 
-    def save(self, commit=True):
-        instance = super().save(commit=False)
-
-        if hasattr(self, "cleaned_data") and "total_days" in self.cleaned_data:
-            instance.total_days = self.cleaned_data["total_days"]
-
-        if commit:
-            instance.save()
-        return instance
-
 
 class LeaveFilterForm(forms.Form):
     STATUS_CHOICES = [("", "All Requests")] + LeaveRequest.STATUS_CHOICES
@@ -149,3 +136,12 @@ class LeaveFilterForm(forms.Form):
         widget=forms.DateInput(attrs={"type": "date", "class": "form-control"}),
         label="To Date",
     )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # dropdown rendered from the cached choices, see LeaveRequestForm
+        leave_type = self.fields["leave_type"]
+        leave_type.choices = [
+            ("", leave_type.empty_label),
+            *active_leave_type_choices(),
+        ]
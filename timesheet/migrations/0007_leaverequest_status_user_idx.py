@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesheet', '0006_leaverequest_user_status_dates_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['status', 'user'], name='lr_status_user_idx'),
+        ),
+    ]
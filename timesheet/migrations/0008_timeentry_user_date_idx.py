@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesheet', '0007_leaverequest_status_user_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', 'date', 'submitted'], name='te_user_date_sub_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesheet', '0008_timeentry_user_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(condition=models.Q(('status', 'APPROVED')), fields=['user', 'start_date', 'end_date'], name='lr_approved_idx'),
+        ),
+    ]
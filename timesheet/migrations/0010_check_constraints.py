@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-15 20:29
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def check_existing_rows(apps, schema_editor):
+    # Rows saved before these checks existed can break them: the weekly form
+    # accepted negative hours and clean() let approved leave days go over 7.5h.
+    # Fail with the offending ids instead of a bare constraint error, so they
+    # can be corrected before migrating again.
+    TimeEntry = apps.get_model("timesheet", "TimeEntry")
+    LeaveRequest = apps.get_model("timesheet", "LeaveRequest")
+
+    problems = {
+        "TimeEntry hours outside 0-7.5": TimeEntry.objects.filter(
+            models.Q(hours__lt=0) | models.Q(hours__gt=Decimal("7.5"))
+        ),
+        "LeaveRequest end_date before start_date": LeaveRequest.objects.filter(
+            start_date__gt=models.F("end_date")
+        ),
+        "LeaveRequest negative total_days": LeaveRequest.objects.filter(
+            total_days__lt=0
+        ),
+    }
+    errors = []
+    for label, qs in problems.items():
+        ids = list(qs.values_list("pk", flat=True)[:20])
+        if ids:
+            errors.append(f"{label}: {qs.count()} row(s), e.g. ids {ids}")
+    if errors:
+        raise RuntimeError(
+            "Fix these rows before adding the check constraints:\n"
+            + "\n".join(errors)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesheet', '0009_leaverequest_approved_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_existing_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='leaverequest',
+            constraint=models.CheckConstraint(condition=models.Q(('start_date__lte', models.F('end_date'))), name='lr_dates_ordered'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaverequest',
+            constraint=models.CheckConstraint(condition=models.Q(('total_days__gte', 0)), name='lr_days_nonneg'),
+        ),
+        migrations.AddConstraint(
+            model_name='timeentry',
+            constraint=models.CheckConstraint(condition=models.Q(('hours__gte', 0), ('hours__lte', Decimal('7.5'))), name='te_hours_range'),
+        ),
+        migrations.AlterField(
+            model_name='timeentry',
+            name='hours',
+            field=models.DecimalField(decimal_places=2, max_digits=4, validators=[django.core.validators.MinValueValidator(Decimal('0')), django.core.validators.MaxValueValidator(Decimal('7.5'))]),
+        ),
+    ]
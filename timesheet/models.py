@@ -1,19 +1,45 @@
 import logging
-from datetime import date, timedelta
+from datetime import date
 from decimal import Decimal
+from functools import cached_property, lru_cache
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.core.mail import send_mail
 from django.db import models
-from django.db.models import Sum
+from django.db.models import Exists, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 # Create your models here.
 logger = logging.getLogger(__name__)
 
 
+# Weekend days in a run of `extra` (0-6) days starting on `start_weekday`,
+# indexed as _TAIL_WEEKENDS[start_weekday][extra] (Monday is 0 and Sunday is 6)
+_TAIL_WEEKENDS = tuple(
+    tuple(sum(1 for i in range(extra) if (start + i) % 7 >= 5) for extra in range(7))
+    for start in range(7)
+)
+
+
+@lru_cache(maxsize=4096)
+def business_days(start_date, end_date):
+    # Business days between two dates (inclusive), memoised since the form,
+    # the HTMX preview and save() all ask for the same date pairs
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        return 0
+
+    # every full week contributes 5 business days, so only the leftover
+    # tail needs its weekend days looked up
+    full_weeks, extra = divmod(days, 7)
+    return full_weeks * 5 + extra - _TAIL_WEEKENDS[start_date.weekday()][extra]
+
+
 class User(AbstractUser):
     employee_id = models.CharField(
         max_length=20, unique=True, help_text="Company-assigned employee id."
@@ -36,9 +62,16 @@ class User(AbstractUser):
         except LeaveEntitlement.DoesNotExist:
             return 0
 
+    @cached_property
+    def is_manager(self):
+        # Whether this user has direct reports, cached on the instance so the
+        # navbar and the manager dashboard share one query per request
+        return self.direct_reports.exists()
+
     def is_manager_of(self, user):
         # A check to see if this user is a manager of another user
-        return user.manager == self
+        # compare ids so the manager row doesn't need to be fetched
+        return user.manager_id == self.pk
 
     def __str__(self):
         return f"{self.get_full_name() or self.username} ({self.employee_id})"
@@ -56,7 +89,16 @@ class TimeEntry(models.Model):
 
     date = models.DateField(help_text="The calendar date for this entry.")
 
-    hours = models.DecimalField(max_digits=4, decimal_places=2)
+    # same bounds as te_hours_range, so full_clean()/clean_fields() reject
+    # bad hours with a ValidationError before the database constraint does
+    hours = models.DecimalField(
+        max_digits=4,
+        decimal_places=2,
+        validators=[
+            MinValueValidator(Decimal("0")),
+            MaxValueValidator(Decimal("7.5")),
+        ],
+    )
 
     # Adding a submitted flag
     submitted = models.BooleanField(
@@ -67,31 +109,60 @@ class TimeEntry(models.Model):
         unique_together = ("user", "project", "date")
         ordering = ["-date"]
         verbose_name = "Time Entry"
+        # (user, date) prefix serves the weekly lookups; trailing submitted
+        # lets the last-submitted aggregate stay inside the index
+        indexes = [
+            models.Index(
+                fields=["user", "date", "submitted"], name="te_user_date_sub_idx"
+            )
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(hours__gte=0) & models.Q(hours__lte=Decimal("7.5")),
+                name="te_hours_range",
+            ),
+        ]
 
     def clean(self):
         super().clean()  # Run the parent clean() first
 
-        from .models import LeaveRequest
-
-        is_leave_day = LeaveRequest.objects.filter(
-            user=self.user,
+        # Fetch the leave-day flag and the hours already logged for this
+        # user + date in a single round-trip, as subqueries on the user row
+        approved_leave = LeaveRequest.objects.filter(
+            user=OuterRef("pk"),
             status="APPROVED",
             start_date__lte=self.date,
             end_date__gte=self.date,
-        ).exists()
+        )
+        other_entries = TimeEntry.objects.filter(user=OuterRef("pk"), date=self.date)
+        if self.pk:
+            other_entries = other_entries.exclude(pk=self.pk)
+        logged_hours = (
+            other_entries.order_by()
+            .values("user")
+            .annotate(total=Sum("hours"))
+            .values("total")
+        )
+
+        checks = (
+            User.objects.filter(pk=self.user_id)
+            .annotate(
+                is_leave_day=Exists(approved_leave),
+                total_hours=Coalesce(
+                    Subquery(logged_hours),
+                    Value(Decimal("0")),
+                    output_field=models.DecimalField(max_digits=4, decimal_places=2),
+                ),
+            )
+            .values("is_leave_day", "total_hours")
+            .first()
+        )
 
         # Skip validation for approved leave days
-        if is_leave_day:
+        if checks is None or checks["is_leave_day"]:
             return
 
-        # Sum existing hours for this user + date
-
-        qs = TimeEntry.objects.filter(user=self.user, date=self.date)
-        if self.pk:
-            qs = qs.exclude(pk=self.pk)
-
-        agg = qs.aggregate(total_hours=Sum("hours"))
-        total = agg["total_hours"] or Decimal("0")
+        total = checks["total_hours"]
 
         # check the new total
         if total + self.hours > Decimal("7.5"):
@@ -99,11 +170,83 @@ class TimeEntry(models.Model):
                 f"Logging {self.hours}h would exceed the total 7.5h for {self.date}."
             )
 
-    def save(self, *args, **kwargs):
-        # Ensuring that clean is called on save()
-        self.full_clean()
+    def save(self, *args, skip_validation=False, **kwargs):
+        # Ensuring that clean is called on save(), unless the caller has
+        # already validated the entry (e.g. as part of a batch)
+        if not skip_validation:
+            # the hours validators cover te_hours_range without a query, so the
+            # database constraint is only a backstop
+            self.full_clean(validate_constraints=False)
         return super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_insert(cls, entries, batch_size=500):
+        # Validate a batch of new entries with two queries instead of two per
+        # row, then insert them with bulk_create. Entries that clash with an
+        # existing (user, project, date) row are reported rather than updated
+        entries = list(entries)
+        if not entries:
+            return []
+
+        for entry in entries:
+            # FK existence checks would cost a query per row, the DB enforces them
+            entry.clean_fields(exclude=["user", "project"])
+
+        user_ids = {entry.user_id for entry in entries}
+        dates = {entry.date for entry in entries}
+
+        # (user, date) pairs covered by approved leave
+        leave_days = set()
+        for user_id, start_date, end_date in LeaveRequest.objects.filter(
+            user_id__in=user_ids,
+            status="APPROVED",
+            start_date__lte=max(dates),
+            end_date__gte=min(dates),
+        ).values_list("user_id", "start_date", "end_date"):
+            leave_days.update(
+                (user_id, d) for d in dates if start_date <= d <= end_date
+            )
+
+        # hours already logged per (user, date) and the (user, project, date)
+        # keys taken, read from the existing rows in one query
+        totals = {}
+        taken = set()
+        for user_id, project_id, entry_date, hours in cls.objects.filter(
+            user_id__in=user_ids, date__in=dates
+        ).values_list("user_id", "project_id", "date", "hours"):
+            day = (user_id, entry_date)
+            totals[day] = totals.get(day, Decimal("0")) + hours
+            taken.add((user_id, project_id, entry_date))
+
+        # top the totals up with this batch in order, reporting each day once
+        # with the same message clean() gives for the entry that crosses 7.5h
+        errors = []
+        over_days = set()
+        for entry in entries:
+            key = (entry.user_id, entry.project_id, entry.date)
+            if key in taken:
+                errors.append(
+                    entry.unique_error_message(cls, ("user", "project", "date"))
+                )
+                continue
+            taken.add(key)
+
+            day = (entry.user_id, entry.date)
+            totals[day] = totals.get(day, Decimal("0")) + entry.hours
+            if (
+                totals[day] > Decimal("7.5")
+                and day not in leave_days
+                and day not in over_days
+            ):
+                over_days.add(day)
+                errors.append(
+                    f"Logging {entry.hours}h would exceed the total 7.5h for {entry.date}."
+                )
+        if errors:
+            raise ValidationError(errors)
+
+        return cls.objects.bulk_create(entries, batch_size=batch_size)
+
     def __str__(self):
         return f"{self.user} - {self.project.code} on {self.date}: {self.hours}h"
 
@@ -141,6 +284,27 @@ class Project(models.Model):
         return f"{self.code} - {self.name}"
 
 
+USER_PROJECTS_CACHE_KEY = "uproj:{}"
+USER_PROJECTS_CACHE_TIMEOUT = 300
+
+
+def user_project_ids(user):
+    # Ids of the user's active projects, cached so the membership join only
+    # runs again after signals.py drops the entry. The cache is per process
+    # and bulk updates send no signals, so this is for listing projects only,
+    # never for deciding whether a user may write to one
+    key = USER_PROJECTS_CACHE_KEY.format(user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(
+            Project.objects.filter(members=user, active=True).values_list(
+                "pk", flat=True
+            )
+        )
+        cache.set(key, ids, USER_PROJECTS_CACHE_TIMEOUT)
+    return ids
+
+
 # A model to represent the different types of leave (Annual, Sick, Maternity, Personal etc.)
 class LeaveType(models.Model):
     name = models.CharField(max_length=50, unique=True)
@@ -156,6 +320,25 @@ class LeaveType(models.Model):
         ordering = ["name"]
 
 
+# Leave types rarely change, so the active dropdown choices are cached and
+# cleared by signals
+ACTIVE_LEAVE_TYPES_CACHE_KEY = "active_leave_type_choices"
+ACTIVE_LEAVE_TYPES_CACHE_TIMEOUT = 300
+
+
+def active_leave_type_choices():
+    # (pk, name) choices for the active leave types, so rendering the dropdown
+    # runs no query on a cache hit. The cache is per process, forms keep
+    # validating against the active queryset in case this copy is stale
+    choices = cache.get(ACTIVE_LEAVE_TYPES_CACHE_KEY)
+    if choices is None:
+        choices = list(LeaveType.objects.filter(active=True).values_list("pk", "name"))
+        cache.set(
+            ACTIVE_LEAVE_TYPES_CACHE_KEY, choices, ACTIVE_LEAVE_TYPES_CACHE_TIMEOUT
+        )
+    return choices
+
+
 # A model that creates leave entitlement information against each type of leave and user
 class LeaveEntitlement(models.Model):
     user = models.ForeignKey(
@@ -171,8 +354,39 @@ class LeaveEntitlement(models.Model):
         unique_together = ("user", "leave_type", "year")
         ordering = ["-year", "leave_type__name"]
 
+    @classmethod
+    def with_usage(cls, qs=None):
+        # Annotate used/remaining days on a queryset of entitlements with one
+        # correlated subquery, instead of an aggregate query per instance
+        if qs is None:
+            qs = cls.objects.all()
+        approved_days = (
+            LeaveRequest.objects.filter(
+                user=OuterRef("user"),
+                leave_type=OuterRef("leave_type"),
+                start_date__year=OuterRef("year"),
+                status="APPROVED",
+            )
+            .order_by()
+            .values("user")
+            .annotate(total=Sum("total_days"))
+            .values("total")
+        )
+        return qs.annotate(
+            used=Coalesce(
+                Subquery(approved_days),
+                Value(Decimal("0")),
+                output_field=models.DecimalField(max_digits=6, decimal_places=1),
+            )
+        ).annotate(remaining=F("allocated_days") - F("used"))
+
     @property
     def used_days(self):
+        # use the with_usage() annotation when present
+        used = getattr(self, "used", None)
+        if used is not None:
+            return used
+
         # calculating used leave days for this entitlement
         return (
             LeaveRequest.objects.filter(
@@ -234,6 +448,29 @@ class LeaveRequest(models.Model):
     class Meta:
         ordering = ["-created"]
         verbose_name = "Leave Request"
+        indexes = [
+            # supports the per-user overlap lookups on status and date range
+            models.Index(
+                fields=["user", "status", "start_date", "end_date"],
+                name="lr_user_status_dates_idx",
+            ),
+            models.Index(fields=["status", "user"], name="lr_status_user_idx"),
+            # TimeEntry validation only ever looks at approved leave
+            models.Index(
+                fields=["user", "start_date", "end_date"],
+                condition=models.Q(status="APPROVED"),
+                name="lr_approved_idx",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(start_date__lte=F("end_date")),
+                name="lr_dates_ordered",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(total_days__gte=0), name="lr_days_nonneg"
+            ),
+        ]
 
     def clean(self):
         super().clean()
@@ -247,8 +484,8 @@ class LeaveRequest(models.Model):
                 raise ValidationError("Cannot request leave from a past date.")
 
     def save(self, *args, **kwargs):
-        # calculating total days if not set
-        if self.start_date and self.end_date and not self.total_days:
+        # total days always follows the dates so it can't go stale when they change
+        if self.start_date and self.end_date:
             self.total_days = self.calculate_business_days()
 
             # self.full_clean()
@@ -260,38 +497,39 @@ class LeaveRequest(models.Model):
         if not self.start_date or not self.end_date:
             return 0
 
-        current_date = self.start_date
-        business_days = 0
-
-        while current_date <= self.end_date:
-            if current_date.weekday() < 5:  # Monday is 0 and Sunday is 6
-                business_days += 1
-            current_date += timedelta(days=1)
-        return business_days
+        return business_days(self.start_date, self.end_date)
 
     def approve(self, approved_by_user):
         # Approve leave request
-        old_status = self.status
+        # the post_save signal sends the notification once the save commits
+        self._status_changed = self.status != "APPROVED"
         self.status = "APPROVED"
         self.approved_by = approved_by_user
         self.approved_at = timezone.now()
         self.save()
 
-        # Send notification after successful save
-        if old_status != "APPROVED":
-            self.send_status_notification()
-
     def reject(self, rejected_by_user, reason=""):
         # Reject leave request
-        old_status = self.status
+        self._status_changed = self.status != "REJECTED"
         self.status = "REJECTED"
         self.approved_by = rejected_by_user
         self.approved_at = timezone.now()
         self.rejection_reason = reason
         self.save()
 
-        if old_status != "REJECTED":
-            self.send_status_notification()
+    def send_submission_emails(self):
+        # Confirmation to the user and notification to the manager, returning
+        # which of the two went out so the view can report it
+        email_results = {"confirmation": False, "manager": False}
+        try:
+            email_results["confirmation"] = self.send_confirmation_email()
+        except Exception as e:
+            logger.error(f"Unexpected error sending confirmation email: {str(e)}")
+        try:
+            email_results["manager"] = self.send_manager_notification()
+        except Exception as e:
+            logger.error(f"Unexpected error sending manager notification: {str(e)}")
+        return email_results
 
     def send_confirmation_email(self):
         # Send a confirmation email to the user when the leave request is submitted
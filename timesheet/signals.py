@@ -1,12 +1,24 @@
+import logging
 from datetime import date
+from functools import partial
 
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import LeaveEntitlement, LeaveType
+from .models import (
+    ACTIVE_LEAVE_TYPES_CACHE_KEY,
+    USER_PROJECTS_CACHE_KEY,
+    LeaveEntitlement,
+    LeaveRequest,
+    LeaveType,
+    Project,
+)
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender=User)
@@ -22,15 +34,83 @@ def create_user_leave_entitlements(sender, instance, created, **kwargs):
             "PL": 5,  # Personal Leave
         }
 
-        for leave_code, allocated_days in STANDARD_ENTITLEMENTS.items():
-            try:
-                leave_type = LeaveType.objects.get(code=leave_code, active=True)
-                LeaveEntitlement.objects.get_or_create(
+        # One query for the leave types and one insert for all entitlements,
+        # missing leave types are skipped and existing rows left untouched
+        leave_types = {
+            leave_type.code: leave_type
+            for leave_type in LeaveType.objects.filter(
+                code__in=STANDARD_ENTITLEMENTS, active=True
+            )
+        }
+        LeaveEntitlement.objects.bulk_create(
+            [
+                LeaveEntitlement(
                     user=instance,
-                    leave_type=leave_type,
+                    leave_type=leave_types[leave_code],
                     year=current_year,
-                    defaults={"allocated_days": allocated_days},
+                    allocated_days=allocated_days,
                 )
-            except LeaveType.DoesNotExist:
-                # Log error or handle missing leave types
-                pass
+                for leave_code, allocated_days in STANDARD_ENTITLEMENTS.items()
+                if leave_code in leave_types
+            ],
+            ignore_conflicts=True,
+        )
+
+
+@receiver(post_save, sender=LeaveType)
+@receiver(post_delete, sender=LeaveType)
+def clear_active_leave_types_cache(sender, **kwargs):
+    """Drop the cached active leave type choices whenever a leave type changes"""
+    cache.delete(ACTIVE_LEAVE_TYPES_CACHE_KEY)
+
+
+def _clear_user_projects_cache(user_ids):
+    cache.delete_many([USER_PROJECTS_CACHE_KEY.format(pk) for pk in user_ids])
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def clear_user_projects_on_membership_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Drop cached project ids for users whose memberships changed"""
+    if reverse:
+        # user.projects.add/remove/clear: only this user is affected
+        if action.startswith("post_"):
+            _clear_user_projects_cache([instance.pk])
+    elif action == "pre_clear":
+        # pk_set is None for clear, so collect the members before they go
+        _clear_user_projects_cache(instance.members.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove"):
+        _clear_user_projects_cache(pk_set)
+
+
+@receiver(post_save, sender=Project)
+@receiver(pre_delete, sender=Project)
+def clear_user_projects_on_project_change(sender, instance, **kwargs):
+    """Archiving or deleting a project changes every member's active list"""
+    _clear_user_projects_cache(instance.members.values_list("pk", flat=True))
+
+
+def send_leave_status_notification(leave_request_id):
+    """Send the approve/reject email, loading everything it needs in one query.
+
+    Called once the save commits. There is no task queue yet, so this still
+    runs inside the manager's request.
+    """
+    leave_request = LeaveRequest.objects.select_related(
+        "user", "approved_by", "leave_type"
+    ).get(pk=leave_request_id)
+    try:
+        leave_request.send_status_notification()
+    except Exception as e:
+        logger.error(f"Unexpected error sending status notification: {str(e)}")
+
+
+@receiver(post_save, sender=LeaveRequest)
+def queue_leave_status_notification(sender, instance, **kwargs):
+    """Send the status email after approve()/reject() changed the status"""
+    # only the explicit flag set by approve()/reject() triggers an email, so
+    # saves from the admin, the shell or fixtures stay silent
+    if getattr(instance, "_status_changed", False):
+        instance._status_changed = False
+        transaction.on_commit(partial(send_leave_status_notification, instance.pk))
@@ -1,3 +1,298 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .forms import LeaveFilterForm
+from .models import LeaveRequest, LeaveType, Project, TimeEntry, User
+
+# Views render {% static %}, which the manifest storage can't resolve in tests
+TEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+    },
+}
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class WeeklyTimesheetTests(TestCase):
+    # ISO week 2031-W10 runs Monday 3 March to Friday 7 March
+    MONDAY = date(2031, 3, 3)
+    TUESDAY = date(2031, 3, 4)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="emp", employee_id="E1", password="pw"
+        )
+        cls.project = Project.objects.create(code="P1", name="Project 1")
+        cls.project.members.add(cls.user)
+        cls.other_project = Project.objects.create(code="P2", name="Project 2")
+        cls.other_project.members.add(cls.user)
+        cls.url = reverse(
+            "timesheet:weekly_with_date", kwargs={"year": 2031, "week_num": 10}
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def post_hours(self, action, hours):
+        # hours maps (project, date) to the posted value
+        data = {"action": action, "viewing_year": "2031", "viewing_week": "10"}
+        for (project, day), value in hours.items():
+            data[f"hours_{project.pk}_{day.isoformat()}"] = value
+        return self.client.post(self.url, data)
+
+    def entry_hours(self):
+        return {
+            (e.project_id, e.date): (e.hours, e.submitted)
+            for e in TimeEntry.objects.filter(user=self.user)
+        }
+
+    def test_save_creates_and_updates_entries(self):
+        TimeEntry.objects.create(
+            user=self.user, project=self.project, date=self.MONDAY, hours=Decimal("2")
+        )
+
+        response = self.post_hours(
+            "save",
+            {
+                (self.project, self.MONDAY): "3",
+                (self.other_project, self.TUESDAY): "4.5",
+            },
+        )
+
+        self.assertRedirects(response, self.url)
+        self.assertEqual(
+            self.entry_hours(),
+            {
+                (self.project.pk, self.MONDAY): (Decimal("3"), False),
+                (self.other_project.pk, self.TUESDAY): (Decimal("4.5"), False),
+            },
+        )
+
+    def test_submit_marks_full_week_submitted(self):
+        week = [date(2031, 3, day) for day in range(3, 8)]
+
+        response = self.post_hours(
+            "submit", {(self.project, day): "7.5" for day in week}
+        )
+
+        self.assertRedirects(response, self.url)
+        self.assertEqual(
+            self.entry_hours(),
+            {(self.project.pk, day): (Decimal("7.5"), True) for day in week},
+        )
+
+    def test_day_limit_counts_saved_rows_that_were_not_posted(self):
+        TimeEntry.objects.create(
+            user=self.user,
+            project=self.other_project,
+            date=self.MONDAY,
+            hours=Decimal("5"),
+        )
+
+        response = self.post_hours("save", {(self.project, self.MONDAY): "3"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Cannot exceed 7.5 hrs on Mon 03/03.")
+        self.assertEqual(
+            self.entry_hours(),
+            {(self.other_project.pk, self.MONDAY): (Decimal("5"), False)},
+        )
+
+    def test_project_the_user_is_not_a_member_of_is_rejected(self):
+        outsider = Project.objects.create(code="PX", name="Other team")
+
+        response = self.post_hours("save", {(outsider, self.MONDAY): "1"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_added_row_shows_leave_badge_on_approved_leave_days(self):
+        leave_type = LeaveType.objects.create(name="Annual", code="AL")
+        LeaveRequest.objects.create(
+            user=self.user,
+            leave_type=leave_type,
+            start_date=self.TUESDAY,
+            end_date=self.TUESDAY,
+            status="APPROVED",
+        )
+
+        response = self.client.post(
+            reverse("timesheet:confirm_add_row") + "?year=2031&week=10",
+            {"project_id": self.project.pk},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"hours_{self.project.pk}_2031-03-03")
+        self.assertNotContains(response, f"hours_{self.project.pk}_2031-03-04")
+        self.assertContains(response, "AL")
+
+    def test_out_of_range_hours_are_rejected(self):
+        for value in ("-3", "8", "NaN"):
+            with self.subTest(value=value):
+                response = self.post_hours(
+                    "save", {(self.project, self.MONDAY): value}
+                )
+
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, "Invalid hours for 2031-03-03.")
+                self.assertFalse(TimeEntry.objects.exists())
+
+
+class ActiveLeaveTypesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_dropdown_renders_without_a_query(self):
+        LeaveType.objects.create(name="Annual", code="AL")
+        str(LeaveFilterForm()["leave_type"])
+
+        with self.assertNumQueries(0):
+            html = str(LeaveFilterForm()["leave_type"])
+        self.assertIn("Annual", html)
+
+    def test_deactivated_type_fails_validation_even_with_stale_cache(self):
+        leave_type = LeaveType.objects.create(name="Annual", code="AL")
+        str(LeaveFilterForm()["leave_type"])
+
+        # a bulk update sends no signal, so the cached choices still include it
+        LeaveType.objects.filter(pk=leave_type.pk).update(active=False)
+
+        form = LeaveFilterForm({"leave_type": leave_type.pk})
+        self.assertFalse(form.is_valid())
+        self.assertIn("leave_type", form.errors)
+
+
+class LeaveNotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user(username="mgr", employee_id="M1")
+        cls.user = User.objects.create_user(
+            username="emp", employee_id="E1", email="e@example.com", manager=cls.manager
+        )
+        cls.leave_type = LeaveType.objects.create(name="Annual", code="AL")
+
+    def create_request(self):
+        return LeaveRequest.objects.create(
+            user=self.user,
+            leave_type=self.leave_type,
+            start_date=date(2031, 3, 3),
+            end_date=date(2031, 3, 4),
+        )
+
+    @mock.patch.object(LeaveRequest, "send_manager_notification")
+    @mock.patch.object(LeaveRequest, "send_confirmation_email")
+    def test_creating_outside_the_form_sends_no_email(self, confirmation, manager):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_request()
+
+        confirmation.assert_not_called()
+        manager.assert_not_called()
+
+    @mock.patch.object(LeaveRequest, "send_status_notification")
+    def test_approve_sends_status_email_once_committed(self, status):
+        leave_request = self.create_request()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            leave_request.approve(self.manager)
+
+        self.assertEqual(len(callbacks), 1)
+        status.assert_called_once_with()
+
+
+class TimeEntryBulkInsertTests(TestCase):
+    DAY = date(2031, 3, 3)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="emp", employee_id="E1")
+        cls.project = Project.objects.create(code="P1", name="Project 1")
+        cls.other_project = Project.objects.create(code="P2", name="Project 2")
+        cls.leave_type = LeaveType.objects.create(name="Annual", code="AL")
+
+    def entry(self, project, hours, day=DAY):
+        return TimeEntry(user=self.user, project=project, date=day, hours=hours)
+
+    def test_inserts_valid_entries(self):
+        created = TimeEntry.bulk_insert(
+            [
+                self.entry(self.project, Decimal("4")),
+                self.entry(self.other_project, Decimal("3.5")),
+            ]
+        )
+
+        self.assertEqual(len(created), 2)
+        self.assertEqual(TimeEntry.objects.count(), 2)
+
+    def test_rejects_day_over_limit_including_saved_hours(self):
+        TimeEntry.objects.create(
+            user=self.user, project=self.project, date=self.DAY, hours=Decimal("5")
+        )
+
+        with self.assertRaises(ValidationError) as cm:
+            TimeEntry.bulk_insert([self.entry(self.other_project, Decimal("3"))])
+
+        self.assertEqual(
+            cm.exception.messages,
+            ["Logging 3h would exceed the total 7.5h for 2031-03-03."],
+        )
+        self.assertEqual(TimeEntry.objects.count(), 1)
+
+    def test_skips_limit_on_approved_leave_days(self):
+        LeaveRequest.objects.create(
+            user=self.user,
+            leave_type=self.leave_type,
+            start_date=self.DAY,
+            end_date=self.DAY,
+            status="APPROVED",
+        )
+
+        TimeEntry.bulk_insert(
+            [
+                self.entry(self.project, Decimal("7.5")),
+                self.entry(self.other_project, Decimal("7.5")),
+            ]
+        )
+
+        self.assertEqual(TimeEntry.objects.count(), 2)
+
+    def test_rejects_duplicates_of_saved_and_batched_rows(self):
+        TimeEntry.objects.create(
+            user=self.user, project=self.project, date=self.DAY, hours=Decimal("1")
+        )
+
+        for batch in (
+            [self.entry(self.project, Decimal("2"))],
+            [
+                self.entry(self.other_project, Decimal("1")),
+                self.entry(self.other_project, Decimal("1")),
+            ],
+        ):
+            with self.subTest(batch=batch), self.assertRaises(ValidationError) as cm:
+                TimeEntry.bulk_insert(batch)
+
+            self.assertEqual(
+                cm.exception.messages,
+                ["Time Entry with this User, Project and Date already exists."],
+            )
+        self.assertEqual(TimeEntry.objects.count(), 1)
+
+    def test_rejects_hours_outside_range_before_the_database(self):
+        for hours in (Decimal("-1"), Decimal("8")):
+            with self.subTest(hours=hours):
+                with self.assertRaises(ValidationError) as cm:
+                    TimeEntry.bulk_insert([self.entry(self.project, hours)])
+                self.assertIn("hours", cm.exception.message_dict)
+
+                with self.assertRaises(ValidationError) as cm:
+                    self.entry(self.project, hours).save()
+                self.assertIn("hours", cm.exception.message_dict)
+
+        self.assertFalse(TimeEntry.objects.exists())
@@ -1,136 +1,233 @@
-import json
 import logging
 import re
 from datetime import date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Max, Q
+from django.db.models import Q
 from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.dateparse import parse_date
 
 from .forms import LeaveFilterForm, LeaveRequestForm
-from .models import LeaveEntitlement, LeaveRequest, LeaveType, Project, TimeEntry
+from .models import (
+    LeaveEntitlement,
+    LeaveRequest,
+    Project,
+    TimeEntry,
+    business_days,
+    user_project_ids,
+)
 
 HOURS_RE = re.compile(r"^hours_(\d+)_(\d{4}-\d{2}-\d{2})$")
+
+# Hour constants, built once rather than parsed from strings on every request
+ZERO = Decimal("0")
+FULL_DAY = Decimal("7.5")
+FULL_WEEK = Decimal("37.5")
+# Daily limit in hundredths of an hour, for the integer sums in the POST check
+FULL_DAY_CENTS = 750
+# Project columns the timesheet rows and "+ ADD ROW" list actually render
+ROW_PROJECT_FIELDS = ("id", "code", "name")
 logger = logging.getLogger(__name__)
 
 
+def _timesheet_row(project, days, entries, total, leave_details=None):
+    # Precompute one project's grid row so templates iterate it directly
+    # instead of calling a lookup tag per cell
+    leave_details = leave_details or {}
+    cells = [
+        {
+            "day": d,
+            "value": entries.get((project.id, d), ""),
+            "leave": leave_details[d]["type"] if d in leave_details else None,
+        }
+        for d in days
+    ]
+    return {"project": project, "cells": cells, "total": total}
+
+
+def _approved_leave(user, days):
+    # {day: {"type", "request_id"}} for the days covered by the user's
+    # approved leave, shared by the weekly grid and "+ ADD ROW" rows
+    week_start, week_end = days[0], days[-1]
+    leave_details = {}
+
+    leave_requests = LeaveRequest.objects.filter(
+        user=user,
+        status="APPROVED",
+        start_date__lte=week_end,
+        end_date__gte=week_start,
+    ).select_related("leave_type")
+
+    for leave_request in leave_requests:
+        # Only the week's business days (Monday-Friday) can be leave days,
+        # so test those against the overlapping part of the request
+        first_day = max(leave_request.start_date, week_start)
+        last_day = min(leave_request.end_date, week_end)
+
+        for d in days:
+            if first_day <= d <= last_day:
+                leave_details[d] = {
+                    "type": leave_request.leave_type.code,
+                    "request_id": leave_request.id,
+                }
+    return leave_details
+
+
+@lru_cache(maxsize=512)
+def _week_days(year, week):
+    # Monday-Friday of an ISO week, built once per week rather than per request
+    week_start = date.fromisocalendar(year, week, 1)
+    return tuple(week_start + timedelta(days=i) for i in range(5))
+
+
+def _week_window(year=None, week_num=None):
+    # Weekdays, ISO year/week and draft session key for the requested week,
+    # falling back to the current week when none is given
+    if year and week_num:
+        iso_year, iso_week = int(year), int(week_num)
+    else:
+        iso_year, iso_week, _ = date.today().isocalendar()
+    session_key = f"timesheet_draft_{iso_year}_{iso_week}"
+    return _week_days(iso_year, iso_week), iso_year, iso_week, session_key
+
+
+def _draft_entries(draft):
+    # Parse a week's {"<pid>|<iso_date>": hours} session draft into
+    # {(project_id, date): hours} in one pass
+    entries = {}
+    for key, hrs in draft.items():
+        if "|" not in key:
+            continue
+        pid, dt_str = key.split("|", 1)
+        try:
+            dt = parse_date(dt_str)
+            if dt is not None:
+                entries[(int(pid), dt)] = Decimal(hrs)
+        except (TypeError, ValueError, InvalidOperation):
+            continue
+    return entries
+
+
+def _upsert_entries(user, raw, submitted):
+    # Write every posted cell in one query rather than an update_or_create per
+    # cell, project membership is checked by the caller beforehand
+    TimeEntry.objects.bulk_create(
+        [
+            TimeEntry(
+                user=user, project_id=pid, date=dt, hours=hrs, submitted=submitted
+            )
+            for (pid, dt), hrs in raw.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "project", "date"],
+        update_fields=["hours", "submitted"],
+    )
+
+
 @login_required
 def weekly_timesheet(request, year=None, week_num=None):
     # 1) Determine the week window
-    today = date.today()
-
     if request.method == "POST":
         viewing_year = request.POST.get("viewing_year")
         viewing_week = request.POST.get("viewing_week")
         if viewing_year and viewing_week:
-            year, week_num = int(viewing_year), int(viewing_week)
+            year, week_num = viewing_year, viewing_week
 
     # For GET requests or if no form data, URL parameters can be used
-    if year and week_num:
-        year, week_num = int(year), int(week_num)
-        week_start = date.fromisocalendar(year, week_num, 1)
-    else:
-        week_start = today - timedelta(days=today.weekday())
-
-    # weekdays (Monday-Friday)
-    days = [week_start + timedelta(days=i) for i in range(5)]
-    print(f"DEBUG: days = {[d.strftime('%Y-%m-%d %A') for d in days]}")
-    days_json = json.dumps([d.isoformat() for d in days])
+    # 2) The weekdays and single session_key for this week come with it
+    days, iso_year, iso_week, session_key = _week_window(year, week_num)
 
-    week_end = days[-1]
-
-    # 2) Single session_key for this week
-    iso_year, iso_week, _ = week_start.isocalendar()
-    session_key = f"timesheet_draft_{iso_year}_{iso_week}"
+    week_start, week_end = days[0], days[-1]
 
     # Get approved leave days for this week
-    approved_leave_days = set()
-    leave_details = {}
-
-    leave_requests = LeaveRequest.objects.filter(
-        user=request.user,
-        status="APPROVED",
-        start_date__lte=week_end,
-        end_date__gte=week_start,
-    )
-
-    for leave_request in leave_requests:
-        # Calculate which days in this week are leave days
-        current_date = max(leave_request.start_date, week_start)
-        end_date = min(leave_request.end_date, week_end)
-
-        while current_date <= end_date:
-            # Only count business days (Monday-Friday) - skip weekends
-            if current_date.weekday() < 5:  # 0=Monday, 4=Friday
-                approved_leave_days.add(current_date)
-                leave_details[current_date] = {
-                    "type": leave_request.leave_type.code,
-                    "request_id": leave_request.id,
-                }
-            current_date += timedelta(days=1)
+    leave_details = _approved_leave(request.user, days)
+    approved_leave_days = set(leave_details)
 
     # 3) POST: Save draft or Submit
     if request.method == "POST":
-        # DEBUG: see exactly what arrives
-        print("===== FORM PAYLOAD =====")
-        print(request.POST.dict())
-        print("========================")
-
         action = request.POST.get("action")
         raw = {}
-        daily_totals = {d: Decimal("0") for d in days}
+        # day totals in whole hundredths of an hour (the precision hours are
+        # stored at), so the per-cell sums are int rather than Decimal adds
+        daily_cents = dict.fromkeys(days, 0)
         errors = []
 
-        # parse fields hours_<pid>_<date>
+        # parse fields hours_<pid>_<date>, matching dates against this week
+        # directly instead of parsing each one
+        day_by_str = {d.isoformat(): d for d in days}
         for name, val in request.POST.items():
-            m = HOURS_RE.match(name)
-            if not m or not val:
+            # cheap prefix check keeps csrf/action/etc. away from the regex
+            if not val or not name.startswith("hours_"):
+                continue
+            if not (m := HOURS_RE.match(name)):
                 continue
             pid_str, date_str = m.groups()
 
-            dt = parse_date(date_str)
-            if dt not in days:
+            dt = day_by_str.get(date_str)
+            if dt is None:
                 continue
 
             try:
                 hrs = Decimal(val)
             except InvalidOperation:
+                hrs = None
+            # out of range hours would otherwise only be caught by the
+            # te_hours_range constraint, as an IntegrityError on save
+            if hrs is None or not hrs.is_finite() or not ZERO <= hrs <= FULL_DAY:
                 errors.append(f"Invalid hours for {date_str}.")
                 continue
 
-            daily_totals[dt] += hrs
-            if daily_totals[dt] > Decimal("7.5"):
+            daily_cents[dt] += int(hrs.scaleb(2).to_integral_value())
+            if daily_cents[dt] > FULL_DAY_CENTS:
                 errors.append(f"Cannot exceed 7.5 hrs on {dt:%a %m/%d}.")
 
             raw[(int(pid_str), dt)] = hrs
 
+        # Entries are written with bulk_create, which skips TimeEntry.clean(), so
+        # hours already saved on rows that weren't posted count towards the day here
+        for pid, dt, hrs in TimeEntry.objects.filter(
+            user=request.user, date__in=days
+        ).values_list("project_id", "date", "hours"):
+            if (pid, dt) in raw or dt in approved_leave_days:
+                continue
+            daily_cents[dt] += int(hrs.scaleb(2))
+            error = f"Cannot exceed 7.5 hrs on {dt:%a %m/%d}."
+            if daily_cents[dt] > FULL_DAY_CENTS and error not in errors:
+                errors.append(error)
+
         if errors:
             for e in errors:
                 messages.error(request, e)
         else:
+            # every posted project must be one of the user's active projects,
+            # checked with one query up front instead of a lookup per cell.
+            # This stays on the database rather than user_project_ids(), whose
+            # cache is per worker and may lag a membership change
+            pids = {pid for pid, _ in raw}
+            valid_pids = set(
+                Project.objects.filter(
+                    id__in=pids, members=request.user, active=True
+                ).values_list("id", flat=True)
+            )
+            if pids - valid_pids:
+                return HttpResponseBadRequest("Unknown or inactive project.")
+
             # --- SAVE DRAFT ---
             if action == "save":
-                print(f"[DEBUG] raw → {raw}")
-                print(f"[DEBUG] saving to database as drafts")  # noqa: F541
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Saving timesheet as draft: raw=%r", raw)
 
                 with transaction.atomic():
-                    for (pid, dt), hrs in raw.items():
-                        project = get_object_or_404(
-                            Project, pk=pid, members=request.user, active=True
-                        )
-                        TimeEntry.objects.update_or_create(
-                            user=request.user,
-                            project=project,
-                            date=dt,
-                            defaults={"hours": hrs, "submitted": False},
-                        )
-                request.session.pop(session_key, None)
+                    _upsert_entries(request.user, raw, submitted=False)
+                # only mark the session dirty when a draft was really there
+                if session_key in request.session:
+                    del request.session[session_key]
                 messages.success(request, "Timesheet saved successfully.")
                 return redirect(request.path)
 
@@ -146,9 +243,9 @@ def weekly_timesheet(request, year=None, week_num=None):
 
                 # calculating total hours for the week
                 manual_hours = sum(raw.values())
-                leave_hours = len(approved_leave_days) * Decimal("7.5")
+                leave_hours = FULL_DAY * len(approved_leave_days)
                 total_week_hours = manual_hours + leave_hours
-                expected_hours = Decimal("37.5")
+                expected_hours = FULL_WEEK
 
                 if total_week_hours < expected_hours:
                     messages.error(
@@ -159,111 +256,95 @@ def weekly_timesheet(request, year=None, week_num=None):
                     return redirect(request.path)
                 # if validation above passes then proceed with saving to the database
                 with transaction.atomic():
-                    for (pid, dt), hrs in raw.items():
-                        project = get_object_or_404(
-                            Project, pk=pid, members=request.user, active=True
-                        )
-                        TimeEntry.objects.update_or_create(
-                            user=request.user,
-                            project=project,
-                            date=dt,
-                            defaults={"hours": hrs, "submitted": True},
-                        )
-                request.session.pop(session_key, None)
+                    _upsert_entries(request.user, raw, submitted=True)
+                if session_key in request.session:
+                    del request.session[session_key]
                 messages.success(request, "Timesheet submitted successfully.")
                 return redirect(request.path)
 
     # GET (or POST-with-errors): load DB entries + overlay draft
 
-    # IDs already in DB
-    db_ids = set(
-        TimeEntry.objects.filter(user=request.user, date__in=days)
-        .values_list("project_id", flat=True)
-        .distinct()
+    # Build entries map from DB, the IDs already in DB and the last submitted
+    # date come from the same rows
+    qs = TimeEntry.objects.filter(user=request.user, date__in=days).values_list(
+        "project_id", "date", "hours", "submitted"
     )
-
-    # IDs in session-draft
-    draft = request.session.get(session_key, {})
-    draft_ids = set()
+    entries = {}
+    last_submitted = None
+    for pid, d, hrs, submitted in qs:
+        entries[(pid, d)] = hrs
+        if submitted and (last_submitted is None or d > last_submitted):
+            last_submitted = d
+    db_ids = {pid for (pid, _) in entries}
 
     # Only use session data if there are no database entries for this week
+    draft_entries = {}
     if not db_ids:
-        for key in draft:
-            if "|" not in key:
-                continue
-            pid_str, _ = key.split("|", 1)
-            try:
-                draft_ids.add(int(pid_str))
-            except ValueError:
-                pass
+        draft_entries = _draft_entries(request.session.get(session_key, {}))
+    draft_ids = {pid for (pid, _) in draft_entries}
 
     # Union rows to show
     all_ids = db_ids | draft_ids
 
-    print(f"[DEBUG GET] db_ids={db_ids} draft_ids={draft_ids} all_ids={all_ids}")
-
-    projects = Project.objects.filter(id__in=all_ids, members=request.user, active=True)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Timesheet rows: db_ids=%r draft_ids=%r all_ids=%r",
+            db_ids,
+            draft_ids,
+            all_ids,
+        )
 
-    # Build entries map from DB + draft
-    qs = TimeEntry.objects.filter(user=request.user, date__in=days)
-    entries = {(e.project_id, e.date): e.hours for e in qs}
+    # One query for the rows shown, limited to the user's projects. The cached
+    # ids are only used for display, writes check membership against the
+    # database
+    projects = list(
+        Project.objects.filter(
+            id__in=all_ids.intersection(user_project_ids(request.user)),
+            active=True,
+        ).only(*ROW_PROJECT_FIELDS)
+    )
 
-    # Only use session data if no database entries exist for the this week
-    if not entries:
-        for key, val in draft.items():
-            if "|" not in key:
-                continue
-            pid_str, dt_str = key.split("|", 1)
-            try:
-                pid, dt = int(pid_str), parse_date(dt_str)
-                hrs = Decimal(val)
-            except (ValueError, InvalidOperation):
-                continue
-            entries[(pid, dt)] = hrs
+    # Overlay the draft (only ever non-empty when the DB has no entries)
+    entries.update(draft_entries)
 
-    # Check for last submission timestamp
-    # This helps record a form submission timestamp, in case a user decided to update a previous or current weeks hours
-    last_submitted = TimeEntry.objects.filter(
-        user=request.user, date__in=days, submitted=True
-    ).aggregate(last_submitted=Max("date"))["last_submitted"]
+    # 5) Totals, accumulated in one pass over the entries rather than a
+    # lookup per (project, day) cell
+    project_totals = {p.id: 0 for p in projects}
+    day_totals = {d: ZERO for d in days}
+    for (pid, d), hrs in entries.items():
+        if pid in project_totals and d in day_totals:
+            project_totals[pid] += hrs
+            day_totals[d] += hrs
 
-    # 5) Totals
-    project_totals = {
-        p.id: sum(entries.get((p.id, d), 0) for d in days) for p in projects
-    }
-    # Calculate day totals including leave hours
-    day_totals = {}
-    for d in days:
-        manual_hours = sum(entries.get((p.id, d), 0) for p in projects)
-        leave_hours = Decimal("7.5") if d in approved_leave_days else Decimal("0")
-        day_totals[d] = manual_hours + leave_hours
+    # Add leave hours to the day totals
+    for d in approved_leave_days:
+        day_totals[d] += FULL_DAY
 
     # calculate week total including leave hours
     week_total = sum(day_totals.values())
 
-    # 6) Projects available for “+ ADD ROW”
-    available_projects = Project.objects.filter(
-        members=request.user, active=True
-    ).exclude(id__in=all_ids)
+    # Grid rows and footer cells, built once for the template
+    rows = [
+        _timesheet_row(p, days, entries, project_totals[p.id], leave_details)
+        for p in projects
+    ]
+    total_cells = [
+        {"day": d, "total": day_totals[d], "leave": d in approved_leave_days}
+        for d in days
+    ]
 
     context = {
         "week_start": week_start,
         "week_end": week_end,
         "days": days,
-        "days_json": days_json,
-        "projects": projects,
-        "entries": entries,
-        "project_totals": project_totals,
-        "day_totals": day_totals,
+        "rows": rows,
+        "total_cells": total_cells,
         "week_total": week_total,
-        "available_projects": available_projects,
         "prev_year": iso_year,
         "prev_week": iso_week - 1 or 52,
         "next_year": iso_year,
         "next_week": iso_week + 1,
         "last_submitted": last_submitted,
-        "approved_leave_days": approved_leave_days,
-        "leave_details": leave_details,
     }
 
     # Check if this is an HTMX request (for week navigation)
@@ -296,17 +377,7 @@ def remove_project(request, project_id):
 @login_required
 def add_row(request):
     # same week logic as weekly_timesheet
-    year = request.GET.get("year")
-    week_num = request.GET.get("week")
-
-    today = date.today()
-    if year and week_num:
-        year, week_num = int(year), int(week_num)
-        week_start = date.fromisocalendar(year, week_num, 1)
-    else:
-        week_start = today - timedelta(days=today.weekday())
-
-    days = [week_start + timedelta(days=i) for i in range(5)]
+    days = _week_window(request.GET.get("year"), request.GET.get("week"))[0]
 
     # which projects already shown
     used_ids = set(
@@ -315,9 +386,11 @@ def add_row(request):
         .distinct()
     )
 
-    available_projects = Project.objects.filter(
-        members=request.user, active=True
-    ).exclude(id__in=used_ids)
+    available_projects = list(
+        Project.objects.filter(id__in=user_project_ids(request.user), active=True)
+        .exclude(id__in=used_ids)
+        .only(*ROW_PROJECT_FIELDS)
+    )
 
     return render(
         request,
@@ -335,63 +408,40 @@ def confirm_add_row(request):
     if not pid:
         return HttpResponseBadRequest("no project_id")
 
-    # pull in the project instance
-    project = get_object_or_404(Project, pk=pid, members=request.user, active=True)
-
-    year = request.GET.get("year")
-    week_num = request.GET.get("week")
+    # pull in the project instance, checking membership against the database
+    project = get_object_or_404(
+        Project.objects.only(*ROW_PROJECT_FIELDS),
+        pk=pid,
+        members=request.user,
+        active=True,
+    )
 
-    # same week logic
-    today = date.today()
-    if year and week_num:
-        year, week_num = int(year), int(week_num)
-        week_start = date.fromisocalendar(year, week_num, 1)
-    else:
-        week_start = today - timedelta(days=today.weekday())
-    days = [week_start + timedelta(days=i) for i in range(5)]
+    # same week logic, the session key matches weekly_timesheet’s key
+    days, _, _, session_key = _week_window(
+        request.GET.get("year"), request.GET.get("week")
+    )
 
     # load DB entries and session draft exactly as in your main view...
-    db_entries = {
+    entries = {
         (e.project_id, e.date): e.hours
         for e in TimeEntry.objects.filter(user=request.user, date__in=days)
     }
 
-    # session key must match weekly_timesheet’s key
-    iso_year, iso_week, _ = week_start.isocalendar()
-    session_key = f"timesheet_draft_{iso_year}_{iso_week}"
-    draft = request.session.get(session_key, {})
-
-    entries = db_entries.copy()
-    for key, val in draft.items():
-        pid_str, dt_str = key.split("|", 1)
-        try:
-            pid_i = int(pid_str)
-            dt = parse_date(dt_str)
-            entries[(pid_i, dt)] = Decimal(val)
-        except Exception:
-            continue
-
-    # now compute totals exactly as your main GET does
-    projects = Project.objects.filter(
-        id__in={project.id},  # only the one we’re adding
-        members=request.user,
-        active=True,
-    )
+    # like the main view, the draft only matters when the DB has nothing yet,
+    # so the session store isn't touched otherwise
+    if not entries:
+        entries = _draft_entries(request.session.get(session_key, {}))
 
-    project_totals = {
-        p.id: sum(entries.get((p.id, d), 0) for d in days) for p in projects
-    }
+    # the project was already checked above, so total its row directly
+    total = sum(entries.get((project.id, d), 0) for d in days)
 
-    # render the **full row**
+    # render the **full row**, with leave badges on approved leave days like
+    # the rows the weekly view renders
+    leave_details = _approved_leave(request.user, days)
     return render(
         request,
         "timesheet/row.html",
-        {
-            "project": project,
-            "days": days,
-            "entries": entries,
-            "project_totals": project_totals,
-        },
+        {"row": _timesheet_row(project, days, entries, total, leave_details)},
     )
 
 
@@ -401,9 +451,11 @@ def leave_request_form(request):
     current_year = date.today().year
 
     # Get user's leave entitlements for current year
-    entitlements = LeaveEntitlement.objects.filter(
-        user=request.user, year=current_year
-    ).select_related("leave_type")
+    entitlements = LeaveEntitlement.with_usage(
+        LeaveEntitlement.objects.filter(
+            user=request.user, year=current_year
+        ).select_related("leave_type")
+    )
 
     if request.method == "POST":
         form = LeaveRequestForm(request.POST, user=request.user)
@@ -413,9 +465,8 @@ def leave_request_form(request):
             # Set the user BEFORE any validation
             leave_request.user = request.user
 
-            # Calculate business days if not already set
-            if not leave_request.total_days:
-                leave_request.total_days = leave_request.calculate_business_days()
+            # Calculate business days up front for the balance check below
+            leave_request.total_days = leave_request.calculate_business_days()
 
             # Validate entitlement
             try:
@@ -460,19 +511,7 @@ def leave_request_form(request):
             # Now save to database (skip model validation)
             leave_request.save()
 
-            email_results = {"confirmation": False, "manager": False}
-
-            # Send confirmation email
-            try:
-                email_results["confirmation"] = leave_request.send_confirmation_email()
-            except Exception as e:
-                logger.error(f"Unexpected error sending confirmation email: {str(e)}")
-
-                # send confirmation to manager
-            try:
-                email_results["manager"] = leave_request.send_manager_notification()
-            except Exception as e:
-                logger.error(f"Unexpected error sending manager notification: {str(e)}")
+            email_results = leave_request.send_submission_emails()
 
             success_message = (
                 f"Leave request submitted successfully! "
@@ -589,9 +628,9 @@ def calculate_days_htmx(request):
                 },
             )
 
-        # Calculate business days
-        temp_request = LeaveRequest(start_date=start, end_date=end)
-        days = temp_request.calculate_business_days()
+        # Calculate business days straight from the dates, no throwaway
+        # LeaveRequest instance needed
+        days = business_days(start, end)
 
         # Check balance if leave type is selected
         balance_warning = False
@@ -599,16 +638,17 @@ def calculate_days_htmx(request):
 
         if leave_type_id:
             try:
-                leave_type = LeaveType.objects.get(id=leave_type_id)
-                entitlement = LeaveEntitlement.objects.get(
-                    user=request.user, leave_type=leave_type, year=start.year
-                )
+                # one query for the entitlement, its leave type and usage
+                entitlement = LeaveEntitlement.with_usage(
+                    LeaveEntitlement.objects.select_related("leave_type")
+                ).get(user=request.user, leave_type_id=leave_type_id, year=start.year)
+                leave_type = entitlement.leave_type
 
                 if days > entitlement.remaining_days:
                     balance_warning = True
                     balance_message = f"You have {entitlement.remaining_days} days remaining for {leave_type.name}, but you're requesting {days} days."
 
-            except (LeaveType.DoesNotExist, LeaveEntitlement.DoesNotExist):
+            except LeaveEntitlement.DoesNotExist:
                 balance_warning = True
                 balance_message = (
                     f"No leave entitlement found for this leave type in {start.year}."
@@ -645,10 +685,11 @@ def check_balance_htmx(request):
         )
 
     try:
-        leave_type = LeaveType.objects.get(id=leave_type_id)
-        entitlement = LeaveEntitlement.objects.get(
-            user=request.user, leave_type=leave_type, year=current_year
-        )
+        # one query for the entitlement, its leave type and usage
+        entitlement = LeaveEntitlement.with_usage(
+            LeaveEntitlement.objects.select_related("leave_type")
+        ).get(user=request.user, leave_type_id=leave_type_id, year=current_year)
+        leave_type = entitlement.leave_type
 
         return render(
             request,
@@ -660,7 +701,7 @@ def check_balance_htmx(request):
             },
         )
 
-    except (LeaveType.DoesNotExist, LeaveEntitlement.DoesNotExist):
+    except LeaveEntitlement.DoesNotExist:
         return render(
             request,
             "partials/leave_balance_info.html",
@@ -674,33 +715,60 @@ def check_balance_htmx(request):
 @login_required
 def manager_dashboard(request):
     """Dashboard for managers to review leave requests"""
-    # Check if user is a manager (has direct reports)
-    if not request.user.direct_reports.exists():
+    # Check if user is a manager (has direct reports), the result is cached on
+    # the user so the navbar doesn't query it again
+    if not request.user.is_manager:
         messages.error(
             request, "You don't have permission to access the manager dashboard."
         )
         return redirect("timesheet:my_requests")
 
-    # Get pending requests for direct reports
+    # Get pending requests for direct reports, paginated and limited to the
+    # columns the dashboard shows
     pending_requests = (
         LeaveRequest.objects.filter(user__manager=request.user, status="PENDING")
         .select_related("user", "leave_type")
+        .only(
+            "id",
+            "status",
+            "start_date",
+            "end_date",
+            "total_days",
+            "comments",
+            "created",
+            "user__first_name",
+            "user__last_name",
+            "user__employee_id",
+            "leave_type__name",
+        )
         .order_by("created")
     )
+    paginator = Paginator(pending_requests, 25)
+    pending_page = paginator.get_page(request.GET.get("page"))
 
     # Get recent decisions
-    recent_decisions = (
+    recent_decisions = list(
         LeaveRequest.objects.filter(
             approved_by=request.user, status__in=["APPROVED", "REJECTED"]
         )
         .select_related("user", "leave_type")
+        .only(
+            "id",
+            "status",
+            "start_date",
+            "end_date",
+            "approved_at",
+            "user__first_name",
+            "user__last_name",
+            "leave_type__name",
+        )
         .order_by("-approved_at")[:10]
     )
 
     return render(
         request,
         "leave_request/manager_dashboard.html",
-        {"pending_requests": pending_requests, "recent_decisions": recent_decisions},
+        {"pending_requests": pending_page, "recent_decisions": recent_decisions},
     )
 
 